@@ -9,55 +9,66 @@ optionally generate an AI summary and post results to Notion/Slack.
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-
-import requests
-from dotenv import load_dotenv
-
+from itertools import chain
+from operator import itemgetter
+from statistics import fmean
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from gh_graphql import (
+    author_login,
+    hours_between,
+    iter_review_comments,
+    parse_datetime,
+    search_pull_requests,
+)
 from gh_utils import (
     get_github_client,
+    get_github_token,
+    get_openai_client,
+    get_session,
+    install_http_cache,
+    stream_chat_completion,
     parse_date_range,
     get_authenticated_username,
 )
 
-try:
-    import openai
-except Exception:
-    openai = None
-
-
-load_dotenv()
+_PR_FIELDS = """
+url
+createdAt
+mergedAt
+reviews(first: 100) { totalCount nodes { author { login } state submittedAt } }
+comments(first: 100) { totalCount nodes { author { login } } }
+reviewThreads(first: 100) {
+  totalCount
+  nodes { comments(first: 20) { totalCount nodes { author { login } } } }
+}
+"""
 
 
-def fetch_pr_issues(
-    g,
+def fetch_pr_nodes(
+    token: str,
     username: str,
     start_dt: datetime,
     end_dt: datetime,
-):
-    """Return issues for PRs authored by `username` in the date range."""
+) -> List[Dict]:
+    """Return GraphQL nodes for PRs authored by `username` in the date range."""
     start_s = start_dt.date().isoformat()
     end_s = end_dt.date().isoformat()
     query = f"type:pr author:{username} created:{start_s}..{end_s}"
     print(f"Fetching PRs with query: {query}")
-    return g.search_issues(query)
+    return list(search_pull_requests(query, _PR_FIELDS, token))
 
 
-def count_comments_received(pr, username: str) -> int:
+def count_comments_received(pr: Dict, username: str) -> int:
     """Count comments on `pr` that were made by others (not `username`)."""
-    cnt = 0
-    for c in pr.get_review_comments():
-        if c.user and c.user.login != username:
-            cnt += 1
-    for c in pr.get_issue_comments():
-        if c.user and c.user.login != username:
-            cnt += 1
-    return cnt
+    comments = chain(iter_review_comments(pr), pr["comments"]["nodes"])
+    return sum(1 for c in comments if author_login(c) not in (None, username))
 
 
 def process_pr_timings(
-    pr, username: str
+    pr: Dict, username: str
 ) -> Tuple[List[float], Optional[float]]:
     """Return (approval_deltas, merged_delta) in hours for `pr`.
 
@@ -65,27 +76,28 @@ def process_pr_timings(
     """
     approval_deltas: List[float] = []
     merged_delta = None
+    created_at = parse_datetime(pr["createdAt"])
 
-    for r in pr.get_reviews():
+    get_fields = itemgetter("state", "submittedAt")
+    for r in pr["reviews"]["nodes"]:
         # only consider reviews by other users
-        if not (r.user and r.user.login != username):
+        if author_login(r) in (None, username):
             continue
-        state = (r.state or "").upper()
-        if state == "CHANGES_REQUESTED":
-            # count as a change request (higher-level caller will tally)
-            pass
-        if state == "APPROVED" and getattr(r, "submitted_at", None):
-            delta = (r.submitted_at - pr.created_at).total_seconds() / 3600.0
+        state, submitted = get_fields(r)
+        # only approvals need their timestamp parsed
+        if (state or "").upper() == "APPROVED" and submitted:
+            delta = hours_between(created_at, parse_datetime(submitted))
             approval_deltas.append(delta)
 
-    if pr.merged_at:
-        merged_delta = (pr.merged_at - pr.created_at).total_seconds() / 3600.0
+    merged_at = parse_datetime(pr["mergedAt"])
+    if merged_at:
+        merged_delta = hours_between(created_at, merged_at)
 
     return approval_deltas, merged_delta
 
 
 def aggregate_pr_stats(
-    issues, g, username: str, start_dt: datetime, end_dt: datetime
+    prs: Iterable[Dict], username: str, start_dt: datetime, end_dt: datetime
 ) -> Dict:
     """Aggregate statistics across PRs authored by `username`."""
     prs_count = 0
@@ -93,16 +105,21 @@ def aggregate_pr_stats(
     approval_hours: List[float] = []
     merged_hours: List[float] = []
     comments_received = 0
+    seen = set()
+
+    for pr in prs:
+        # search pagination can return the same PR twice when results shift
+        if pr["url"] in seen:
+            continue
+        seen.add(pr["url"])
 
-    for issue in issues:
-        repo = g.get_repo(issue.repository.full_name)
-        pr = repo.get_pull(issue.number)
         prs_count += 1
 
         # reviews from others
-        for r in pr.get_reviews():
-            if r.state and r.user and r.user.login != username:
-                if r.state.upper() == "CHANGES_REQUESTED":
+        for r in pr["reviews"]["nodes"]:
+            login = author_login(r)
+            if r["state"] and login and login != username:
+                if r["state"].upper() == "CHANGES_REQUESTED":
                     change_requests_received += 1
 
         # timings
@@ -114,12 +131,8 @@ def aggregate_pr_stats(
         # comments
         comments_received += count_comments_received(pr, username)
 
-    avg_approval = (
-        sum(approval_hours) / len(approval_hours) if approval_hours else None
-    )
-    avg_merged = (
-        sum(merged_hours) / len(merged_hours) if merged_hours else None
-    )
+    avg_approval = fmean(approval_hours) if approval_hours else None
+    avg_merged = fmean(merged_hours) if merged_hours else None
 
     return {
         "start": start_dt,
@@ -164,10 +177,9 @@ def format_plain_report(stats: Dict) -> str:
 
 def generate_ai_summary(stats: Dict, max_tokens: int = 150) -> Optional[str]:
     """Generate a brief AI summary using OpenAI if configured."""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key or openai is None:
+    client = get_openai_client()
+    if client is None:
         return None
-    openai.api_key = api_key
     prompt = (
         "You are a concise assistant. Summarize the following GitHub PR "
         "stats in 2-3 short sentences:\n"
@@ -177,13 +189,14 @@ def generate_ai_summary(stats: Dict, max_tokens: int = 150) -> Optional[str]:
         "Also mention average hours to approval/merge if available."
     )
     try:
-        resp = openai.ChatCompletion.create(
+        summary = stream_chat_completion(
+            client,
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
             temperature=0.2,
         )
-        return resp.choices[0].message.content.strip()
+        return summary.strip()
     except Exception:
         return None
 
@@ -219,7 +232,7 @@ def post_to_notion(
             }
         ],
     }
-    r = requests.post(url, headers=headers, json=payload, timeout=10)
+    r = get_session().post(url, headers=headers, json=payload, timeout=10)
     return 200 <= r.status_code < 300
 
 
@@ -229,12 +242,35 @@ def post_to_slack(summary: str, slack_webhook: str) -> bool:
         return False
     payload = {"text": summary}
     try:
-        r = requests.post(slack_webhook, json=payload, timeout=5)
+        r = get_session().post(slack_webhook, json=payload, timeout=5)
         return 200 <= r.status_code < 300
     except Exception:
         return False
 
 
+def post_summary(summary: str, enable_notion: bool, enable_slack: bool):
+    """Post `summary` to the enabled integrations concurrently.
+
+    Notion and Slack are independent, so both requests run in parallel and
+    the total latency is the slowest post instead of their sum.
+    """
+    futures = {}
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        if enable_notion:
+            futures["Notion"] = ex.submit(
+                post_to_notion,
+                summary,
+                os.environ.get("NOTION_TOKEN"),
+                os.environ.get("NOTION_PAGE_ID"),
+            )
+        if enable_slack:
+            futures["Slack"] = ex.submit(
+                post_to_slack, summary, os.environ.get("SLACK_WEBHOOK")
+            )
+    for name, future in futures.items():
+        print(f"{name} post: {'OK' if future.result() else 'Failed'}")
+
+
 def main(
     start: Optional[str],
     end: Optional[str],
@@ -242,13 +278,19 @@ def main(
     enable_notion: bool,
     enable_slack: bool,
 ):
-    g = get_github_client()
-    username = get_authenticated_username(g)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    token = get_github_token()
+    install_http_cache(token)
+    g = get_github_client(token)
+    username = get_authenticated_username(g, token)
     print(f"Generating PRs report for user: {username}")
     start_dt, end_dt = parse_date_range(start, end)
     print(f"Date range: {start_dt.date().isoformat()} .. {end_dt.date().isoformat()}")
-    issues = fetch_pr_issues(g, username, start_dt, end_dt)
-    stats = aggregate_pr_stats(issues, g, username, start_dt, end_dt)
+    prs = fetch_pr_nodes(token, username, start_dt, end_dt)
+    stats = aggregate_pr_stats(prs, username, start_dt, end_dt)
 
     plain = format_plain_report(stats)
     print(plain)
@@ -258,20 +300,7 @@ def main(
         if ai_summary:
             print("\nAI summary:\n" + ai_summary)
 
-        if enable_notion:
-            notion_token = os.environ.get("NOTION_TOKEN")
-            notion_page_id = os.environ.get("NOTION_PAGE_ID")
-            ok = post_to_notion(
-                ai_summary or plain,
-                notion_token,
-                notion_page_id,
-            )
-            print(f"Notion post: {'OK' if ok else 'Failed'}")
-
-        if enable_slack:
-            slack_webhook = os.environ.get("SLACK_WEBHOOK")
-            ok = post_to_slack(ai_summary or plain, slack_webhook)
-            print(f"Slack post: {'OK' if ok else 'Failed'}")
+        post_summary(ai_summary or plain, enable_notion, enable_slack)
 
 
 def parse_args() -> argparse.Namespace:
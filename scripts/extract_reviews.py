@@ -16,35 +16,55 @@ Environment variables used:
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-
-import requests
-from dotenv import load_dotenv
-
+from itertools import chain
+from operator import itemgetter
+from statistics import fmean
+from typing import Dict, Iterable, List, Optional
+
+from gh_graphql import (
+    author_login,
+    hours_between,
+    iter_review_comments,
+    parse_datetime,
+    search_pull_requests,
+)
 from gh_utils import (
     get_github_client,
+    get_github_token,
+    get_openai_client,
+    get_session,
+    install_http_cache,
+    stream_chat_completion,
     parse_date_range,
     get_authenticated_username,
 )
 
-try:
-    import openai
-except Exception:
-    openai = None
-
-
-load_dotenv()
+# Reviews are filtered server-side to the ones written by $login
+_PR_FIELDS = """
+url
+createdAt
+reviews(first: 100, author: $login) {
+  totalCount
+  nodes { author { login } state submittedAt }
+}
+comments(first: 100) { totalCount nodes { author { login } createdAt } }
+reviewThreads(first: 100) {
+  totalCount
+  nodes { comments(first: 20) { totalCount nodes { author { login } createdAt } } }
+}
+"""
 
 
-def fetch_review_issues(
-    g,
+def fetch_review_nodes(
+    token: str,
     username: str,
     start_dt: datetime,
     end_dt: datetime,
-):
+) -> List[Dict]:
     """
-    Return issues for PRs reviewed by `username` in the date range.
+    Return GraphQL nodes for PRs reviewed by `username` in the date range.
     """
     start_s = start_dt.date().isoformat()
     end_s = end_dt.date().isoformat()
@@ -52,11 +72,18 @@ def fetch_review_issues(
         f"type:pr reviewed-by:{username} "
         f"updated:{start_s}..{end_s}"
     )
-    return g.search_issues(query)
+    return list(
+        search_pull_requests(
+            query,
+            _PR_FIELDS,
+            token,
+            extra_variables={"login": ("String!", username)},
+        )
+    )
 
 
 def count_comments_for_pr(
-    pr,
+    pr: Dict,
     username: str,
     start_dt: datetime,
     end_dt: datetime,
@@ -64,26 +91,17 @@ def count_comments_for_pr(
     """
     Count inline and issue comments by `username` on `pr`.
     """
-    cnt = 0
-    for c in pr.get_review_comments():
-        if (
-            c.user
-            and c.user.login == username
-            and start_dt <= c.created_at <= end_dt
-        ):
-            cnt += 1
-    for c in pr.get_issue_comments():
-        if (
-            c.user
-            and c.user.login == username
-            and start_dt <= c.created_at <= end_dt
-        ):
-            cnt += 1
-    return cnt
+    comments = chain(iter_review_comments(pr), pr["comments"]["nodes"])
+    return sum(
+        1
+        for c in comments
+        if author_login(c) == username
+        and start_dt <= parse_datetime(c["createdAt"]) <= end_dt
+    )
 
 
 def process_review_events(
-    pr, username: str, start_dt: datetime, end_dt: datetime
+    pr: Dict, username: str, start_dt: datetime, end_dt: datetime
 ) -> (int, int, int, List[float]):
     """
     Process review events and return totals and deltas.
@@ -94,38 +112,44 @@ def process_review_events(
     approvals = 0
     changes = 0
     deltas: List[float] = []
-    for r in pr.get_reviews():
-        submitted = getattr(r, "submitted_at", None)
-        if not (r.user and submitted):
+    created_at = parse_datetime(pr["createdAt"])
+    get_fields = itemgetter("state", "submittedAt")
+    for r in pr["reviews"]["nodes"]:
+        state, submitted = get_fields(r)
+        # pending reviews have no submission date
+        if not submitted or author_login(r) != username:
             continue
-        if not (r.user.login == username and start_dt <= submitted <= end_dt):
+        submitted = parse_datetime(submitted)
+        if not start_dt <= submitted <= end_dt:
             continue
         total += 1
-        state = (r.state or "").upper()
+        state = (state or "").upper()
         if state == "APPROVED":
             approvals += 1
         if state == "CHANGES_REQUESTED":
             changes += 1
-        delta = (submitted - pr.created_at).total_seconds() / 3600.0
-        deltas.append(delta)
+        deltas.append(hours_between(created_at, submitted))
     return total, approvals, changes, deltas
 
 
 def aggregate_review_stats(
-    issues, g, username: str, start_dt: datetime, end_dt: datetime
+    prs: Iterable[Dict], username: str, start_dt: datetime, end_dt: datetime
 ) -> Dict:
     """
-    Aggregate counts and timing metrics from the given issues.
+    Aggregate counts and timing metrics from the given PR nodes.
     """
     total_reviews = 0
     approvals = 0
     change_requests = 0
     comment_count = 0
     pr_review_deltas: List[float] = []
+    seen = set()
 
-    for issue in issues:
-        repo = g.get_repo(issue.repository.full_name)
-        pr = repo.get_pull(issue.number)
+    for pr in prs:
+        # search pagination can return the same PR twice when results shift
+        if pr["url"] in seen:
+            continue
+        seen.add(pr["url"])
 
         comment_count += count_comments_for_pr(
             pr, username, start_dt, end_dt
@@ -138,11 +162,7 @@ def aggregate_review_stats(
         change_requests += cr
         pr_review_deltas.extend(deltas)
 
-    avg_review_hours = (
-        sum(pr_review_deltas) / len(pr_review_deltas)
-        if pr_review_deltas
-        else None
-    )
+    avg_review_hours = fmean(pr_review_deltas) if pr_review_deltas else None
 
     return {
         "start": start_dt,
@@ -184,11 +204,10 @@ def generate_ai_summary(stats: Dict, max_tokens: int = 150) -> Optional[str]:
 
     Returns the summary string or None if OpenAI is not configured.
     """
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key or openai is None:
+    client = get_openai_client()
+    if client is None:
         return None
 
-    openai.api_key = api_key
     prompt = (
         "You are a concise assistant. Summarize the following GitHub review "
         "stats in 2-3 short sentences:\n"
@@ -201,13 +220,14 @@ def generate_ai_summary(stats: Dict, max_tokens: int = 150) -> Optional[str]:
     )
 
     try:
-        resp = openai.ChatCompletion.create(
+        summary = stream_chat_completion(
+            client,
             model="gpt-3.5-turbo",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
             temperature=0.2,
         )
-        return resp.choices[0].message.content.strip()
+        return summary.strip()
     except Exception:
         return None
 
@@ -247,7 +267,7 @@ def post_to_notion(
         ],
     }
 
-    r = requests.post(url, headers=headers, json=payload, timeout=10)
+    r = get_session().post(url, headers=headers, json=payload, timeout=10)
     return 200 <= r.status_code < 300
 
 
@@ -259,12 +279,35 @@ def post_to_slack(summary: str, slack_webhook: str) -> bool:
         return False
     payload = {"text": summary}
     try:
-        r = requests.post(slack_webhook, json=payload, timeout=5)
+        r = get_session().post(slack_webhook, json=payload, timeout=5)
         return 200 <= r.status_code < 300
     except Exception:
         return False
 
 
+def post_summary(summary: str, enable_notion: bool, enable_slack: bool):
+    """Post `summary` to the enabled integrations concurrently.
+
+    Notion and Slack are independent, so both requests run in parallel and
+    the total latency is the slowest post instead of their sum.
+    """
+    futures = {}
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        if enable_notion:
+            futures["Notion"] = ex.submit(
+                post_to_notion,
+                summary,
+                os.environ.get("NOTION_TOKEN"),
+                os.environ.get("NOTION_PAGE_ID"),
+            )
+        if enable_slack:
+            futures["Slack"] = ex.submit(
+                post_to_slack, summary, os.environ.get("SLACK_WEBHOOK")
+            )
+    for name, future in futures.items():
+        print(f"{name} post: {'OK' if future.result() else 'Failed'}")
+
+
 def main(
     start: Optional[str],
     end: Optional[str],
@@ -272,12 +315,18 @@ def main(
     enable_notion: bool,
     enable_slack: bool,
 ):
-    g = get_github_client()
-    username = get_authenticated_username(g)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    token = get_github_token()
+    install_http_cache(token)
+    g = get_github_client(token)
+    username = get_authenticated_username(g, token)
     start_dt, end_dt = parse_date_range(start, end)
 
-    issues = fetch_review_issues(g, username, start_dt, end_dt)
-    stats = aggregate_review_stats(issues, g, username, start_dt, end_dt)
+    prs = fetch_review_nodes(token, username, start_dt, end_dt)
+    stats = aggregate_review_stats(prs, username, start_dt, end_dt)
 
     plain = format_plain_report(stats)
     print(plain)
@@ -288,20 +337,7 @@ def main(
         if ai_summary:
             print("\nAI summary:\n" + ai_summary)
 
-        if enable_notion:
-            notion_token = os.environ.get("NOTION_TOKEN")
-            notion_page_id = os.environ.get("NOTION_PAGE_ID")
-            notion_post_success = post_to_notion(
-                ai_summary or plain, notion_token, notion_page_id
-            )
-            print(f"Notion post: {'OK' if notion_post_success else 'Failed'}")
-
-        if enable_slack:
-            slack_webhook = os.environ.get("SLACK_WEBHOOK")
-            slack_post_success = post_to_slack(
-                ai_summary or plain, slack_webhook
-            )
-            print(f"Slack post: {'OK' if slack_post_success else 'Failed'}")
+        post_summary(ai_summary or plain, enable_notion, enable_slack)
 
 
 def parse_args() -> argparse.Namespace:
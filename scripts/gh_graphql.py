@@ -0,0 +1,141 @@
+"""Small helpers for the GitHub GraphQL API.
+
+The report scripts use GraphQL to fetch PRs together with their reviews
+and comments in one request per page of search results, instead of
+several REST calls per PR.
+
+Notes
+- Nested connections (reviews, comments, review threads) are fetched with
+  a fixed page size and are not paginated further. The report scripts ask
+  for the first 100 reviews, comments and review threads of each PR, and
+  only the first 20 comments of each review thread.
+- Connections selected with `totalCount` are checked after each page;
+  a warning is printed for PRs whose counts are based on partial data.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from gh_utils import RateLimitError, get_graphql_session, retry_on_ratelimit
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+_ONE_HOUR = timedelta(hours=1)
+
+_SEARCH_QUERY = """
+query($q: String!, $first: Int!, $cursor: String%s) {
+  search(query: $q, type: ISSUE, first: $first, after: $cursor) {
+    pageInfo { hasNextPage endCursor }
+    nodes { ... on PullRequest { %s } }
+  }
+}
+"""
+
+
+@retry_on_ratelimit
+def run_query(query: str, variables: Optional[Dict], token: str) -> Dict:
+    """POST `query` to the GraphQL endpoint and return its `data` payload.
+
+    Rate-limited queries are retried after the wait GitHub asks for.
+    Raises RuntimeError when GitHub returns errors and no data.
+    """
+    headers = {"Authorization": f"bearer {token}"}
+    payload = {"query": query, "variables": variables or {}}
+    session = get_graphql_session()
+    r = session.post(GRAPHQL_URL, headers=headers, json=payload, timeout=30)
+    body = r.json() if r.ok else {}
+    # an error answer served from the HTTP cache would make every retry
+    # fail the same way without reaching GitHub, so ask GitHub again
+    if body.get("errors") and getattr(r, "from_cache", False):
+        with session.cache_disabled():
+            r = session.post(
+                GRAPHQL_URL, headers=headers, json=payload, timeout=30
+            )
+        body = r.json() if r.ok else {}
+    if r.status_code in (403, 429) and "rate limit" in r.text.lower():
+        raise RateLimitError("GraphQL rate limit exceeded", r.headers)
+    r.raise_for_status()
+    errors = body.get("errors") or []
+    if any(e.get("type") == "RATE_LIMITED" for e in errors):
+        raise RateLimitError("GraphQL rate limit exceeded", r.headers)
+    if errors and not body.get("data"):
+        messages = "; ".join(e.get("message", "") for e in errors)
+        raise RuntimeError(f"GraphQL query failed: {messages}")
+    return body["data"]
+
+
+def search_pull_requests(
+    search_query: str,
+    pr_fields: str,
+    token: str,
+    page_size: int = 50,
+    extra_variables: Optional[Dict[str, Tuple[str, Any]]] = None,
+) -> Iterator[Dict]:
+    """Yield PR nodes matching `search_query`, following search pagination.
+
+    `pr_fields` is the GraphQL selection applied to each PullRequest node.
+    `extra_variables` maps variable names used in `pr_fields` to
+    (GraphQL type, value), e.g. {"login": ("String!", "octocat")}.
+    """
+    extra_variables = extra_variables or {}
+    declarations = "".join(
+        f", ${name}: {type_}" for name, (type_, _) in extra_variables.items()
+    )
+    query = _SEARCH_QUERY % (declarations, pr_fields)
+    cursor = None
+    while True:
+        variables = {"q": search_query, "first": page_size, "cursor": cursor}
+        variables.update(
+            {name: value for name, (_, value) in extra_variables.items()}
+        )
+        search = run_query(query, variables, token)["search"]
+        for node in search["nodes"]:
+            # non-PR results come back as empty objects
+            if node:
+                if is_truncated(node):
+                    print(
+                        f"Warning: {node.get('url', 'a PR')} has more items "
+                        "than fetched, its counts may be incomplete"
+                    )
+                yield node
+        if not search["pageInfo"]["hasNextPage"]:
+            break
+        cursor = search["pageInfo"]["endCursor"]
+
+
+def is_truncated(node: Any) -> bool:
+    """Return True if any connection within `node` has more items than fetched.
+
+    Only connections that select `totalCount` alongside `nodes` are checked.
+    """
+    if isinstance(node, list):
+        return any(is_truncated(item) for item in node)
+    if not isinstance(node, dict):
+        return False
+    nodes = node.get("nodes")
+    if isinstance(nodes, list) and node.get("totalCount", 0) > len(nodes):
+        return True
+    return any(is_truncated(value) for value in node.values())
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO-8601 timestamp into a timezone-aware datetime."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def hours_between(start: datetime, end: datetime) -> float:
+    """Return the number of hours from `start` to `end`."""
+    return (end - start) / _ONE_HOUR
+
+
+def author_login(node: Dict) -> Optional[str]:
+    """Return the author login of a node, or None for deleted accounts."""
+    author = node.get("author")
+    return author["login"] if author else None
+
+
+def iter_review_comments(pr: Dict) -> Iterator[Dict]:
+    """Yield inline review comments across all review threads of `pr`."""
+    for thread in pr["reviewThreads"]["nodes"]:
+        yield from thread["comments"]["nodes"]
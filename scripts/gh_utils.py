@@ -1,32 +1,221 @@
 """Helper utilities for GitHub reports.
 
 Uses PyGithub to access GitHub REST API.
-Provides helpers to create the client, parse dates and get username.
+Provides helpers to create the client, parse dates and get username,
+plus a shared `requests` session for the other HTTP calls, a shared
+OpenAI client and an optional on-disk cache for GitHub API responses.
 
 Notes
 - `parse_date_range` now accepts optional start/end and will default to
   (today - 1 year) .. today when values are omitted. Returned datetimes
   are timezone-aware (UTC).
 """
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Mapping, Optional, Tuple, TypeVar
 from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlparse
 from dateutil import parser as dateparser
 from dateutil.relativedelta import relativedelta
+import hashlib
+import importlib
 import os
+import time
 
-from github import Github
+# Heavy third-party modules (PyGithub, requests, openai, requests-cache) are
+# imported inside the helpers that need them to keep CLI start-up fast.
+if TYPE_CHECKING:
+    import requests
+    from github import Github
 
+# Size of the HTTP connection pools (PyGithub and the shared session)
+POOL_SIZE = 20
 
-def get_github_client(token: Optional[str] = None) -> Github:
-    """Return a PyGithub Github client.
+# Items per page for PyGithub paginated lists (GitHub's maximum)
+PER_PAGE = 100
+
+# Directory for on-disk caches (HTTP responses, ...)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gh_reports")
+
+_session: Optional["requests.Session"] = None
+_graphql_session: Optional["requests.Session"] = None
+_openai_client = None
+
+T = TypeVar("T")
+
+
+def _import_optional(name: str):
+    """Import and return module `name`, or None when it is unavailable."""
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def _make_session(retry_post: bool) -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    allowed_methods = Retry.DEFAULT_ALLOWED_METHODS
+    if retry_post:
+        allowed_methods = allowed_methods | {"POST"}
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=allowed_methods,
+        # hand the last response back so callers can report it themselves
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=10, pool_maxsize=POOL_SIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Return the shared `requests.Session` used for non-PyGithub HTTP calls.
+
+    The session keeps TCP/TLS connections alive between calls to the same
+    host. Idempotent methods (GET, HEAD, ...) are retried on 429/502/503/504
+    with backoff; POSTs are sent once, so Notion/Slack posts are never
+    duplicated.
+    """
+    global _session
+    if _session is None:
+        _session = _make_session(retry_post=False)
+    return _session
+
+
+def get_graphql_session() -> "requests.Session":
+    """Return the shared `requests.Session` for GitHub GraphQL queries.
+
+    Like `get_session`, but POSTs are retried on 429/502/503/504 with
+    backoff too: GraphQL queries are read-only, so resending them is safe.
+    """
+    global _graphql_session
+    if _graphql_session is None:
+        _graphql_session = _make_session(retry_post=True)
+    return _graphql_session
+
+
+def get_openai_client():
+    """Return the shared OpenAI client, or None when it is not configured.
+
+    Needs the `openai` package (v1+) and the OPENAI_API_KEY environment
+    variable. The client keeps its HTTP connection pool across calls.
+    """
+    global _openai_client
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    if _openai_client is None:
+        openai = _import_optional("openai")
+        if openai is None:
+            return None
+        _openai_client = openai.OpenAI(api_key=api_key)
+    return _openai_client
+
+
+def stream_chat_completion(
+    client, on_text: Optional[Callable[[str], None]] = None, **kwargs
+) -> str:
+    """Run a streamed chat completion and return the full response text.
+
+    `kwargs` are passed to `client.chat.completions.create`. `on_text`, when
+    given, is called with each text fragment as soon as it arrives.
+    """
+    parts = []
+    for chunk in client.chat.completions.create(stream=True, **kwargs):
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if text:
+            parts.append(text)
+            if on_text:
+                on_text(text)
+    return "".join(parts)
+
+
+def _token_key(token: str) -> str:
+    """Return a short, non-reversible key identifying `token`."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _is_github_response(response: "requests.Response") -> bool:
+    url = urlparse(response.url)
+    if url.hostname != "api.github.com":
+        return False
+    # GraphQL reports rate limits and timeouts as 200s carrying `errors`;
+    # caching those would replay the failure on every retry and later run
+    if url.path == "/graphql":
+        try:
+            return not response.json().get("errors")
+        except ValueError:
+            return False
+    return True
+
+
+def install_http_cache(token: str, expire_after: int = 3600) -> bool:
+    """Cache GitHub API responses on disk, using `requests-cache` if installed.
+
+    Patches `requests` globally, so PyGithub and the GraphQL client both go
+    through the cache. Responses honour GitHub's Cache-Control headers (or
+    `expire_after` seconds) and stale entries are revalidated with
+    ETag/Last-Modified, which GitHub does not count against the rate limit.
+    Only api.github.com responses are stored; Notion/Slack posts and
+    GraphQL responses carrying `errors` are not.
+    The cache file is per token so different accounts never share entries.
+
+    Must be called before the clients are created. Returns True when enabled.
+    """
+    requests_cache = _import_optional("requests_cache")
+    if requests_cache is None:
+        return False
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    requests_cache.install_cache(
+        cache_name=os.path.join(CACHE_DIR, f"http_{_token_key(token)}"),
+        backend="sqlite",
+        expire_after=expire_after,
+        cache_control=True,
+        allowable_methods=("GET", "HEAD", "POST"),
+        filter_fn=_is_github_response,
+    )
+    return True
+
+
+def get_github_token(token: Optional[str] = None) -> str:
+    """Return `token` or the `GITHUB_TOKEN` environment variable.
 
-    If `token` is not provided, read the `GITHUB_TOKEN` environment variable.
     Raises EnvironmentError when no token is available.
     """
     token = token or os.environ.get("GITHUB_TOKEN")
     if not token:
         raise EnvironmentError("GITHUB_TOKEN not found in environment variables")
-    return Github(token)
+    return token
+
+
+def get_github_client(token: Optional[str] = None) -> "Github":
+    """Return a PyGithub Github client.
+
+    If `token` is not provided, read the `GITHUB_TOKEN` environment variable.
+    Raises EnvironmentError when no token is available.
+    """
+    from github import Github
+
+    return Github(
+        get_github_token(token), per_page=PER_PAGE, pool_size=POOL_SIZE
+    )
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an ISO date string, falling back to dateutil for other formats."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return dateparser.parse(value)
 
 
 def parse_date_range(start: Optional[str], end: Optional[str]) -> Tuple[datetime, datetime]:
@@ -42,12 +231,12 @@ def parse_date_range(start: Optional[str], end: Optional[str]) -> Tuple[datetime
     now_utc = datetime.now(timezone.utc)
 
     if start:
-        start_dt = dateparser.parse(start)
+        start_dt = _parse_date(start)
     else:
         # default to 1 year ago
         start_dt = now_utc - relativedelta(years=1)
 
-    end_dt = dateparser.parse(end) if end else now_utc
+    end_dt = _parse_date(end) if end else now_utc
 
     # If parsed datetimes are naive, make them UTC-aware
     if start_dt.tzinfo is None:
@@ -58,7 +247,97 @@ def parse_date_range(start: Optional[str], end: Optional[str]) -> Tuple[datetime
     return start_dt, end_dt
 
 
-def get_authenticated_username(g: Github) -> str:
-    """Return the login/username for the authenticated client `g`."""
-    user = g.get_user()
-    return user.login
+def get_authenticated_username(g: "Github", token: Optional[str] = None) -> str:
+    """Return the login/username for the authenticated client `g`.
+
+    When the client's `token` is given, the login is cached on disk under
+    CACHE_DIR (keyed by a hash of the token) so later runs skip the
+    `/user` request.
+    """
+    cache_path = None
+    if token:
+        cache_path = os.path.join(CACHE_DIR, f"user_{_token_key(token)}")
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                login = f.read().strip()
+            if login:
+                return login
+        except OSError:
+            pass
+
+    login = g.get_user().login
+
+    if cache_path:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                f.write(login)
+        except OSError:
+            # caching is best effort
+            pass
+    return login
+
+
+class RateLimitError(Exception):
+    """Raised when GitHub rate limits a request made outside PyGithub.
+
+    `headers` holds the response headers (Retry-After, X-RateLimit-*).
+    """
+
+    def __init__(self, message: str, headers: Optional[Mapping] = None):
+        super().__init__(message)
+        self.headers = headers or {}
+
+
+def _ratelimit_wait(headers: Optional[Mapping], default: float) -> float:
+    """Return how many seconds to wait before retrying, from `headers`.
+
+    Uses Retry-After (secondary limits) or X-RateLimit-Reset once the
+    primary limit is exhausted, falling back to `default`.
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        return float(retry_after)
+    reset = headers.get("x-ratelimit-reset")
+    if reset and headers.get("x-ratelimit-remaining") == "0":
+        return max(0.0, int(reset) - time.time()) + 1
+    return default
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    from github import GithubException, RateLimitExceededException
+
+    if isinstance(exc, (RateLimitError, RateLimitExceededException)):
+        return True
+    # secondary rate limits come back as a plain 403/429
+    return (
+        isinstance(exc, GithubException)
+        and exc.status in (403, 429)
+        and "rate limit" in str(exc).lower()
+    )
+
+
+def retry_on_ratelimit(
+    func: Callable[..., T], retries: int = 3, delay: float = 5.0
+) -> Callable[..., T]:
+    """Wrap `func` so it sleeps and retries when GitHub rate limits it.
+
+    The wait comes from the Retry-After / X-RateLimit-Reset headers when
+    GitHub sends them, otherwise `delay` doubled after each attempt.
+    The last exception is re-raised.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> T:
+        for attempt in range(retries):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == retries - 1 or not _is_rate_limited(e):
+                    raise
+                wait = _ratelimit_wait(
+                    getattr(e, "headers", None), delay * 2 ** attempt
+                )
+                print(f"GitHub rate limit hit, retrying in {wait:.0f}s")
+                time.sleep(wait)
+    return wrapper
@@ -18,14 +18,18 @@ Environment variables:
 """
 
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import List
 
-from dotenv import load_dotenv
-
-from gh_utils import get_github_client, get_authenticated_username
-
-load_dotenv()
+from gh_utils import (
+    get_github_client,
+    get_github_token,
+    get_authenticated_username,
+    install_http_cache,
+    retry_on_ratelimit,
+)
 
 # ANSI colors
 _RESET   = "\033[0m"
@@ -46,6 +50,9 @@ _ACTIONS = {
     "WAITING":   (4, _DIM),
 }
 
+# Number of PRs fetched concurrently (each PR needs several REST calls)
+_MAX_WORKERS = 8
+
 
 def _c(code: str, text: str) -> str:
     return f"{code}{text}{_RESET}"
@@ -88,9 +95,14 @@ def _fmt_age(seconds: float) -> str:
 
 def _get_ci_status(pr) -> str:
     """Return 'pass', 'fail', 'pending', or 'none' based on check runs and commit status."""
-    sha = pr.head.sha
     try:
-        check_runs = list(pr.head.repo.get_commit(sha).get_check_runs())
+        # fetch the head commit once, both lookups below hang off it
+        commit = pr.head.repo.get_commit(pr.head.sha)
+    except Exception:
+        return "none"
+
+    try:
+        check_runs = list(commit.get_check_runs())
     except Exception:
         check_runs = []
 
@@ -103,7 +115,7 @@ def _get_ci_status(pr) -> str:
         return "fail"
 
     try:
-        combined = pr.head.repo.get_commit(sha).get_combined_status()
+        combined = commit.get_combined_status()
         if combined.total_count == 0:
             return "none"
         state = combined.state
@@ -137,51 +149,58 @@ def fetch_my_open_prs(g, username: str):
     return g.search_issues(query)
 
 
-def collect_pr_data(issues, g) -> List[dict]:
+@retry_on_ratelimit
+def _process_one_pr(issue, now: datetime) -> dict:
+    """Fetch the PR behind a search `issue` and return its report entry."""
+    repo_name = issue.repository.full_name
+    # fetch the PR straight from the issue URL, no repository lookup needed
+    pr = issue.as_pull_request()
+
+    age_seconds = (now - pr.created_at).total_seconds()
+    age_days = (now - pr.created_at).days
+
+    # bind review fields once: PyGithub attributes are properties
+    get_fields = attrgetter("user", "state")
+    latest_by_user: dict = {}
+    for r in pr.get_reviews():
+        user, state = get_fields(r)
+        if user and user.type != "Bot":
+            latest_by_user[user.login] = state
+    approvals = sum(1 for s in latest_by_user.values() if s == "APPROVED")
+    has_changes_requested = any(s == "CHANGES_REQUESTED" for s in latest_by_user.values())
+    reviews_done = len(latest_by_user)
+    requested_reviewers = {u.login for u in pr.requested_reviewers if u}
+    total_reviewers = len(set(latest_by_user.keys()) | requested_reviewers)
+
+    mergeable_state = pr.mergeable_state
+    has_conflict = mergeable_state == "dirty"
+
+    ci_status = _get_ci_status(pr)
+    action = _compute_action(approvals, has_conflict, ci_status, age_days, has_changes_requested)
+
+    return {
+        "repo": repo_name,
+        "number": pr.number,
+        "title": pr.title,
+        "url": pr.html_url,
+        "age_seconds": age_seconds,
+        "age_days": age_days,
+        "approvals": approvals,
+        "has_changes_requested": has_changes_requested,
+        "reviews_done": reviews_done,
+        "total_reviewers": total_reviewers,
+        "mergeable_state": mergeable_state,
+        "has_conflict": has_conflict,
+        "ci_status": ci_status,
+        "action": action,
+    }
+
+
+def collect_pr_data(issues) -> List[dict]:
     now = datetime.now(timezone.utc)
-    entries = []
-
-    for issue in issues:
-        repo_name = issue.repository.full_name
-        repo = g.get_repo(repo_name)
-        pr = repo.get_pull(issue.number)
-
-        age_seconds = (now - pr.created_at).total_seconds()
-        age_days = (now - pr.created_at).days
-
-        reviews = list(pr.get_reviews())
-        latest_by_user: dict = {}
-        for r in reviews:
-            if r.user and r.user.type != "Bot":
-                latest_by_user[r.user.login] = r.state
-        approvals = sum(1 for s in latest_by_user.values() if s == "APPROVED")
-        has_changes_requested = any(s == "CHANGES_REQUESTED" for s in latest_by_user.values())
-        reviews_done = len(latest_by_user)
-        requested_reviewers = {u.login for u in pr.requested_reviewers if u}
-        total_reviewers = len(set(latest_by_user.keys()) | requested_reviewers)
-
-        mergeable_state = pr.mergeable_state
-        has_conflict = mergeable_state == "dirty"
-
-        ci_status = _get_ci_status(pr)
-        action = _compute_action(approvals, has_conflict, ci_status, age_days, has_changes_requested)
-
-        entries.append({
-            "repo": repo_name,
-            "number": pr.number,
-            "title": pr.title,
-            "url": pr.html_url,
-            "age_seconds": age_seconds,
-            "age_days": age_days,
-            "approvals": approvals,
-            "has_changes_requested": has_changes_requested,
-            "reviews_done": reviews_done,
-            "total_reviewers": total_reviewers,
-            "mergeable_state": mergeable_state,
-            "has_conflict": has_conflict,
-            "ci_status": ci_status,
-            "action": action,
-        })
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        entries = list(ex.map(lambda i: _process_one_pr(i, now), issues))
 
     entries.sort(key=lambda e: (_ACTIONS[e["action"]][0], -e["age_days"]))
     return entries
@@ -271,12 +290,18 @@ def format_report(entries: List[dict]) -> str:
 
 
 def main():
-    g = get_github_client()
-    username = get_authenticated_username(g)
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    token = get_github_token()
+    install_http_cache(token)
+    g = get_github_client(token)
+    username = get_authenticated_username(g, token)
     print(_c(_DIM, f"Fetching open PRs for: {username}"))
 
     issues = fetch_my_open_prs(g, username)
-    entries = collect_pr_data(issues, g)
+    entries = collect_pr_data(issues)
     print(format_report(entries))
 
 
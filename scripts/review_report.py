@@ -19,14 +19,18 @@ import argparse
 import math
 import os
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import List, Optional
 
-from dotenv import load_dotenv
-
-from gh_utils import get_github_client, get_authenticated_username
-
-load_dotenv()
+from gh_utils import (
+    get_github_client,
+    get_github_token,
+    get_authenticated_username,
+    install_http_cache,
+    retry_on_ratelimit,
+)
 
 # ANSI colors
 _RESET   = "\033[0m"
@@ -38,6 +42,9 @@ _GREEN   = "\033[32m"
 _CYAN    = "\033[36m"
 _MAGENTA = "\033[1;35m"
 
+# Number of PRs fetched concurrently (each PR needs several REST calls)
+_MAX_WORKERS = 8
+
 
 def _c(code: str, text: str) -> str:
     return f"{code}{text}{_RESET}"
@@ -115,54 +122,60 @@ def compute_priority_score(
     return round(score, 1)
 
 
-def collect_pr_data(issues, g, priority_repos: List[str]) -> List[dict]:
+@retry_on_ratelimit
+def _process_one_pr(issue, priority_repos: List[str], now: datetime) -> dict:
+    """Fetch the PR behind a search `issue` and return its report entry."""
+    repo_name = issue.repository.full_name
+    # fetch the PR straight from the issue URL, no repository lookup needed
+    pr = issue.as_pull_request()
+
+    delta = now - pr.updated_at
+    staling_days = delta.days
+    staling_seconds = delta.total_seconds()
+    is_priority = repo_name in priority_repos
+    lines_changed = pr.additions + pr.deletions
+
+    # Count reviewers: pending (requested) and already reviewed
+    # Exclude bot/AI reviewers from count (they don't affect merge requirements)
+    pending_reviewers = set(
+        r.login for r in pr.requested_reviewers if r.type != "Bot"
+    )
+    reviewers = map(attrgetter("user"), pr.get_reviews())
+    reviewed_by = set(u.login for u in reviewers if u and u.type != "Bot")
+    total_reviewers = len(pending_reviewers | reviewed_by)
+    pending_count = len(pending_reviewers)
+
+    score = compute_priority_score(
+        staling_days, is_priority, pr.changed_files, lines_changed,
+        pending_count, total_reviewers
+    )
+
+    return {
+        "repo": repo_name,
+        "title": pr.title,
+        "url": pr.html_url,
+        "author": pr.user.login if pr.user else "unknown",
+        "files_changed": pr.changed_files,
+        "additions": pr.additions,
+        "deletions": pr.deletions,
+        "staling_seconds": staling_seconds,
+        "staling_days": staling_days,
+        "is_priority": is_priority,
+        "priority_score": score,
+        "pending_reviewers": pending_count,
+        "total_reviewers": total_reviewers,
+    }
+
+
+def collect_pr_data(issues, priority_repos: List[str]) -> List[dict]:
     """Build a flat list of PR metadata sorted by priority score descending."""
     now = datetime.now(timezone.utc)
-    entries = []
-
-    for issue in issues:
-        repo_name = issue.repository.full_name
-        repo = g.get_repo(repo_name)
-        pr = repo.get_pull(issue.number)
-
-        delta = now - pr.updated_at
-        staling_days = delta.days
-        staling_seconds = delta.total_seconds()
-        is_priority = repo_name in priority_repos
-        lines_changed = pr.additions + pr.deletions
-
-        # Count reviewers: pending (requested) and already reviewed
-        # Exclude bot/AI reviewers from count (they don't affect merge requirements)
-        pending_reviewers = set(
-            r.login for r in pr.requested_reviewers if r.type != "Bot"
-        )
-        reviewed_by = set(
-            r.user.login for r in pr.get_reviews() if r.user and r.user.type != "Bot"
-        )
-        total_reviewers = len(pending_reviewers | reviewed_by)
-        pending_count = len(pending_reviewers)
 
-        score = compute_priority_score(
-            staling_days, is_priority, pr.changed_files, lines_changed,
-            pending_count, total_reviewers
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        entries = list(
+            ex.map(lambda i: _process_one_pr(i, priority_repos, now), issues)
         )
 
-        entries.append({
-            "repo": repo_name,
-            "title": pr.title,
-            "url": pr.html_url,
-            "author": pr.user.login if pr.user else "unknown",
-            "files_changed": pr.changed_files,
-            "additions": pr.additions,
-            "deletions": pr.deletions,
-            "staling_seconds": staling_seconds,
-            "staling_days": staling_days,
-            "is_priority": is_priority,
-            "priority_score": score,
-            "pending_reviewers": pending_count,
-            "total_reviewers": total_reviewers,
-        })
-
     entries.sort(key=lambda e: e["priority_score"], reverse=True)
     for i, e in enumerate(entries, 1):
         e["rank"] = i
@@ -260,16 +273,22 @@ def format_report(entries: List[dict]) -> str:
 
 
 def main(priority_repos_arg: Optional[str]):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
     priority_repos_env = os.environ.get("PRIORITY_REPOS", "")
     raw = priority_repos_arg or priority_repos_env
     priority_repos = [r.strip() for r in raw.split(",") if r.strip()]
 
-    g = get_github_client()
-    username = get_authenticated_username(g)
+    token = get_github_token()
+    install_http_cache(token)
+    g = get_github_client(token)
+    username = get_authenticated_username(g, token)
     print(_c(_DIM, f"Fetching PRs to review for: {username}"))
 
     issues = fetch_prs_to_review(g, username)
-    entries = collect_pr_data(issues, g, priority_repos)
+    entries = collect_pr_data(issues, priority_repos)
     print(format_report(entries))
 
 
@@ -2,56 +2,175 @@
 weekly_report.py
 Aggregate weekly activity and generate a short AI-written summary.
 By default it operates on the last 7 days. You can pass --start/--end to override.
+By default it reports on the authenticated user. Pass --users u1,u2 to report on several users in one run.
 
 Sends results to Notion (if NOTION_TOKEN and NOTION_PAGE_ID set) and to Slack (if SLACK_WEBHOOK set).
 """
 import argparse
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import os
-from typing import Optional
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-import openai
-from gh_utils import get_github_client, parse_date_range, get_authenticated_username
+from gh_graphql import run_query
+from gh_utils import (
+    CACHE_DIR, _import_optional, get_github_client, get_github_token, get_openai_client, get_session,
+    parse_date_range, get_authenticated_username, install_http_cache, stream_chat_completion,
+)
 
+# Bump when the prompt changes so cached summaries are not reused
+PROMPT_VERSION = "v2"
+# override with the OPENAI_MODEL environment variable
+_DEFAULT_MODEL = "gpt-4o-mini"
+_PROMPT = "Summarize this weekly developer report and add 3 bullet points for next week's learning:\n\n{report_text}"
 
-def collect_counts(g, username: str, start_dt: datetime, end_dt: datetime):
-    # commits: use search commits
-    commits_q = f"author:{username} committer-date:{start_dt.date().isoformat()}..{end_dt.date().isoformat()}"
-    commits = g.search_commits(commits_q)
+# AI summaries are cached on disk, keyed by a hash of prompt version, model and report
+_LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.json")
+_LLM_CACHE_TTL = 7 * 86400
 
-    prs_q = f"type:pr author:{username} created:{start_dt.date().isoformat()}..{end_dt.date().isoformat()}"
-    prs = list(g.search_issues(prs_q))
+# (connect, read) timeouts for Slack/Notion posts
+_POST_TIMEOUT = (3, 10)
 
-    reviews_q = f"type:pr reviewed-by:{username} updated:{start_dt.date().isoformat()}..{end_dt.date().isoformat()}"
-    reviews = list(g.search_issues(reviews_q))
+# one pair of aliased searches per user; first: 0 returns only the counts, no result nodes
+_COUNTS_SEARCH = """
+  u{i}_prs: search(query: $u{i}_prs, type: ISSUE, first: 0) {{ issueCount }}
+  u{i}_reviews: search(query: $u{i}_reviews, type: ISSUE, first: 0) {{ issueCount }}"""
 
-    return len(list(commits)), len(prs), len(reviews)
+# GitHub's commit search is limited to 30 requests a minute, keep concurrency modest
+_MAX_COMMIT_WORKERS = 4
 
 
-def make_ai_summary(openai_key: Optional[str], report_text: str) -> str:
-    if not openai_key:
+def _counts_query(n_users: int) -> str:
+    # aliases are indexed rather than named after users, logins may contain '-'
+    declarations = ", ".join(f"$u{i}_prs: String!, $u{i}_reviews: String!" for i in range(n_users))
+    searches = "".join(_COUNTS_SEARCH.format(i=i) for i in range(n_users))
+    return f"query({declarations}) {{{searches}\n}}"
+
+
+def collect_counts(g, token: str, usernames: List[str], start_dt: datetime, end_dt: datetime) -> Dict[str, Tuple[int, int, int]]:
+    # returns {username: (commits, prs, reviews)}
+    start_s = start_dt.date().isoformat()
+    end_s = end_dt.date().isoformat()
+
+    # PRs and reviews: a single GraphQL request for every user's counts
+    variables = {}
+    for i, username in enumerate(usernames):
+        variables[f"u{i}_prs"] = f"type:pr author:{username} created:{start_s}..{end_s}"
+        variables[f"u{i}_reviews"] = f"type:pr reviewed-by:{username} updated:{start_s}..{end_s}"
+
+    # commits: use search commits, one request per user (GraphQL search has no commit type)
+    def count_commits(username: str) -> int:
+        # read total_count from a 1-item page: PaginatedList.totalCount counts
+        # pages instead, which GitHub caps at 1000 search results
+        _, data = g.requester.requestJsonAndCheck(
+            "GET", "/search/commits",
+            parameters={"q": f"author:{username} committer-date:{start_s}..{end_s}", "per_page": 1},
+        )
+        return data["total_count"]
+
+    # the GraphQL query and the commit searches are independent, run them concurrently
+    with ThreadPoolExecutor(max_workers=min(len(usernames), _MAX_COMMIT_WORKERS) + 1) as ex:
+        counts = ex.submit(run_query, _counts_query(len(usernames)), variables, token)
+        commits = list(ex.map(count_commits, usernames))
+    data = counts.result()
+
+    return {
+        username: (commits[i], data[f"u{i}_prs"]["issueCount"], data[f"u{i}_reviews"]["issueCount"])
+        for i, username in enumerate(usernames)
+    }
+
+
+def _llm_cache_key(model: str, report_text: str) -> str:
+    return hashlib.sha256(f"{PROMPT_VERSION}\0{model}\0{report_text}".encode()).hexdigest()
+
+
+def _load_llm_cache() -> dict:
+    try:
+        with open(_LLM_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _is_fresh(entry, now: float) -> bool:
+    # malformed or empty entries (hand-edited or an older format) count as expired
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("created_at"), (int, float))
+        and isinstance(entry.get("response"), str)
+        and entry["response"] != ""
+        and now - entry["created_at"] < _LLM_CACHE_TTL
+    )
+
+
+def _store_llm_cache(cache: dict):
+    # write a temp file and rename it so readers never see a partial file
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, _LLM_CACHE_PATH)
+    except OSError as e:
+        print("AI summary cache not saved:", e)
+
+
+def make_ai_summary(report_text: str, on_text: Optional[Callable[[str], None]] = None) -> str:
+    # on_text receives the summary as it streams in (not called on cache hits)
+    client = get_openai_client()
+    if client is None:
         return "(No AI key provided) Brief summary:\n" + report_text[:500]
-    openai.api_key = openai_key
+
+    model = os.environ.get("OPENAI_MODEL", _DEFAULT_MODEL)
+    key = _llm_cache_key(model, report_text)
+    cache = _load_llm_cache()
+    now = time.time()
+    entry = cache.get(key)
+    if _is_fresh(entry, now):
+        return entry["response"]
+
     try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": f"Summarize this weekly developer report and add 3 bullet points for next week's learning:\n\n{report_text}"}],
-            max_tokens=400,
-        )
-        return resp.choices[0].message.content.strip()
+        summary = stream_chat_completion(
+            client,
+            on_text=on_text,
+            model=model,
+            messages=[{"role": "user", "content": _PROMPT.format(report_text=report_text)}],
+            max_tokens=256,
+            temperature=0.2,
+        ).strip()
     except Exception as e:
         return f"(AI call failed) {e}\n\n{report_text[:500]}"
 
+    # an empty completion is not worth keeping, the next run retries it
+    if summary:
+        # drop expired entries while writing the new one back
+        cache = {k: v for k, v in cache.items() if _is_fresh(v, now)}
+        cache[key] = {"response": summary, "created_at": now}
+        _store_llm_cache(cache)
+    return summary
+
+
+def _post_json(url: str, payload: dict, headers: Optional[dict] = None):
+    # orjson serializes straight to bytes; fall back to requests' json= encoding
+    orjson = _import_optional("orjson")
+    if orjson is None:
+        return get_session().post(url, json=payload, headers=headers, timeout=_POST_TIMEOUT)
+    headers = {**(headers or {}), "Content-Type": "application/json"}
+    return get_session().post(url, data=orjson.dumps(payload), headers=headers, timeout=_POST_TIMEOUT)
+
 
 def post_to_slack(webhook: str, text: str):
-    import requests
     payload = {"text": text}
-    r = requests.post(webhook, json=payload)
+    r = _post_json(webhook, payload)
     r.raise_for_status()
 
 
 def post_to_notion(token: str, parent_page_id: str, title: str, content: str):
-    import requests
     url = "https://api.notion.com/v1/pages"
     headers = {
         "Authorization": f"Bearer {token}",
@@ -73,59 +192,90 @@ def post_to_notion(token: str, parent_page_id: str, title: str, content: str):
             }
         ]
     }
-    r = requests.post(url, json=data, headers=headers)
+    r = _post_json(url, data, headers)
     r.raise_for_status()
 
 
-def main(start: Optional[str], end: Optional[str]):
-    g = get_github_client()
-    username = get_authenticated_username(g)
-
-    if start and end:
-        start_dt, end_dt = parse_date_range(start, end)
-    else:
-        # default to last 7 days ending now
-        end_dt = datetime.utcnow()
-        start_dt = end_dt - timedelta(days=7)
-
-    commits_count, prs_count, reviews_count = collect_counts(g, username, start_dt, end_dt)
+def report_user(username: str, counts: Tuple[int, int, int], start_s: str, end_s: str):
+    commits_count, prs_count, reviews_count = counts
 
     report_text = (
         f"Weekly report for {username}\n"
-        f"Period: {start_dt.date().isoformat()} - {end_dt.date().isoformat()}\n"
+        f"Period: {start_s} - {end_s}\n"
         f"Commits: {commits_count}\n"
         f"PRs created: {prs_count}\n"
         f"Reviews done: {reviews_count}\n"
     )
 
-    # AI summary
-    ai_summary = make_ai_summary(os.environ.get('OPENAI_API_KEY'), report_text)
+    # print the counts right away, the AI summary can take several seconds
+    print(report_text)
+    print("AI Summary:", flush=True)
+
+    # AI summary, echoed while it streams in
+    streamed = []
+
+    def echo(text: str):
+        streamed.append(text)
+        print(text, end="", flush=True)
+
+    ai_summary = make_ai_summary(report_text, on_text=echo)
+    if streamed:
+        print()
+    # cache hits and fallbacks are not streamed, and a stream that fails
+    # part-way returns the failure text instead of what was echoed
+    if "".join(streamed).strip() != ai_summary:
+        print(ai_summary)
 
     full_report = report_text + "\nAI Summary:\n" + ai_summary
 
-    print(full_report)
+    # optionally send to Slack/Notion, both posts run concurrently
+    posts = {}
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        if os.environ.get('SLACK_WEBHOOK'):
+            posts["Slack"] = ex.submit(post_to_slack, os.environ['SLACK_WEBHOOK'], full_report)
+        if os.environ.get('NOTION_TOKEN') and os.environ.get('NOTION_PAGE_ID'):
+            posts["Notion"] = ex.submit(
+                post_to_notion, os.environ['NOTION_TOKEN'], os.environ['NOTION_PAGE_ID'],
+                f"Weekly report {username} {start_s} - {end_s}",
+                full_report)
 
-    # optionally send to Slack/Notion
-    if os.environ.get('SLACK_WEBHOOK'):
+    for name, future in posts.items():
         try:
-            post_to_slack(os.environ['SLACK_WEBHOOK'], full_report)
-            print("Posted to Slack")
+            future.result()
+            print(f"Posted to {name}")
         except Exception as e:
-            print("Slack post failed:", e)
+            print(f"{name} post failed:", e)
 
-    if os.environ.get('NOTION_TOKEN') and os.environ.get('NOTION_PAGE_ID'):
-        try:
-            post_to_notion(os.environ['NOTION_TOKEN'], os.environ['NOTION_PAGE_ID'],
-                           f"Weekly report {start_dt.date().isoformat()} - {end_dt.date().isoformat()}",
-                           full_report)
-            print("Posted to Notion")
-        except Exception as e:
-            print("Notion post failed:", e)
+
+def main(start: Optional[str], end: Optional[str], users: Optional[List[str]] = None):
+    token = get_github_token()
+    # repeated runs revalidate the commit search with ETags and reuse recent count queries
+    install_http_cache(token)
+    g = get_github_client(token)
+    # the login for this token is cached on disk, so daily runs skip the /user request
+    usernames = users or [get_authenticated_username(g, token)]
+
+    if start and end:
+        start_dt, end_dt = parse_date_range(start, end)
+    else:
+        # default to last 7 days ending now
+        end_dt = datetime.now(timezone.utc)
+        start_dt = end_dt - timedelta(days=7)
+
+    start_s = start_dt.date().isoformat()
+    end_s = end_dt.date().isoformat()
+
+    # counts for every user are fetched up front, summaries are generated per user
+    all_counts = collect_counts(g, token, usernames, start_dt, end_dt)
+    for username in usernames:
+        report_user(username, all_counts[username], start_s, end_s)
 
 
 if __name__ == '__main__':
     p = argparse.ArgumentParser()
     p.add_argument('--start', required=False, help='Start date (ISO)')
     p.add_argument('--end', required=False, help='End date (ISO)')
+    p.add_argument('--users', required=False, help='Comma-separated GitHub logins (default: the authenticated user)')
     args = p.parse_args()
-    main(args.start, args.end)
+    users = [u.strip() for u in args.users.split(',') if u.strip()] if args.users else None
+    main(args.start, args.end, users)
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from gh_utils import _is_github_response  # noqa: E402
+
+
+def _response(url: str, body) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.url = url
+    r._content = json.dumps(body).encode()
+    return r
+
+
+class IsGithubResponseTest(unittest.TestCase):
+    graphql_url = "https://api.github.com/graphql"
+
+    def test_rest_response_is_cached(self):
+        r = _response("https://api.github.com/search/commits", {"total_count": 3})
+        self.assertTrue(_is_github_response(r))
+
+    def test_other_hosts_are_not_cached(self):
+        r = _response("https://api.notion.com/v1/pages", {})
+        self.assertFalse(_is_github_response(r))
+
+    def test_graphql_data_is_cached(self):
+        r = _response(self.graphql_url, {"data": {"prs": {"issueCount": 1}}})
+        self.assertTrue(_is_github_response(r))
+
+    def test_graphql_rate_limited_is_not_cached(self):
+        body = {
+            "data": None,
+            "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}],
+        }
+        self.assertFalse(_is_github_response(_response(self.graphql_url, body)))
+
+    def test_graphql_errors_only_is_not_cached(self):
+        body = {"errors": [{"message": "Something went wrong while executing your query."}]}
+        self.assertFalse(_is_github_response(_response(self.graphql_url, body)))
+
+
+if __name__ == "__main__":
+    unittest.main()